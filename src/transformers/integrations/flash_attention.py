@@ -3,6 +3,7 @@ from typing import Optional, Tuple
 import torch
 
 from ..modeling_flash_attention_utils import _flash_attention_forward, flash_attn_supports_top_left_mask
+from ..pytorch_utils import is_torch_greater_or_equal_than_2_4
 from ..utils import logging
 
 
@@ -44,13 +45,24 @@ def flash_attention_forward(
     # in fp32. (usually our RMSNorm modules handle it correctly)
     target_dtype = None
     if query.dtype == torch.float32:
-        if torch.is_autocast_enabled():
+        device_type = query.device.type
+        # Autocast is device-aware from torch 2.4, which also covers cpu/mps/xpu autocast
+        if is_torch_greater_or_equal_than_2_4 and torch.is_autocast_enabled(device_type):
+            target_dtype = torch.get_autocast_dtype(device_type)
+        elif not is_torch_greater_or_equal_than_2_4 and torch.is_autocast_enabled():
             target_dtype = torch.get_autocast_gpu_dtype()
         # Handle the case where the model is quantized
         elif hasattr(module.config, "_pre_quantization_dtype"):
             target_dtype = module.config._pre_quantization_dtype
         else:
-            target_dtype = next(layer for layer in module.modules() if isinstance(layer, torch.nn.Linear)).weight.dtype
+            # Walking the submodules is costly, so only do it once and cache the Linear layer on the module. Its dtype
+            # is read on every call so that later dtype changes of the model are picked up
+            target_linear = getattr(module, "_fa_target_linear", None)
+            if target_linear is None:
+                target_linear = next(layer for layer in module.modules() if isinstance(layer, torch.nn.Linear))
+                # Bypass `nn.Module.__setattr__`, which would register the layer as a submodule a second time
+                module.__dict__["_fa_target_linear"] = target_linear
+            target_dtype = target_linear.weight.dtype
 
     # FA2 always relies on the value set in the module, so remove it if present in kwargs to avoid passing it twice
     kwargs.pop("is_causal", None)
@@ -158,7 +158,7 @@ def get_max_height_width(
     if input_data_format is None:
         input_data_format = infer_channel_dimension_format(images_list[0][0], num_channels=(1, 3, 4))
 
-    max_height = max_width = float("-inf")
+    max_height = max_width = 0
     for images in images_list:
         for image in images:
             height, width = get_image_size(image, channel_dim=input_data_format)
@@ -122,21 +122,29 @@ def smolvlm_sample_indices_fn(metadata, max_frames, target_fps, skip_secs=0):
     if start_idx >= end_idx:
         start_idx, end_idx = 0, total_num_frames - 1
 
-    indices = np.linspace(start_idx, end_idx, desired_frames, dtype=int)
-    indices = np.unique(indices)
+    if desired_frames == 1:
+        return np.array([start_idx])
 
-    return indices
+    # Step 4) uniformly sample the indices on python ints, same as `np.linspace(..., dtype=int)` + `np.unique`.
+    # The indices are non-decreasing so only adjacent duplicates need to be dropped
+    step = (end_idx - start_idx) / (desired_frames - 1)
+    indices = [start_idx]
+    for i in range(1, desired_frames - 1):
+        index = int(i * step + start_idx)
+        if index != indices[-1]:
+            indices.append(index)
+    if end_idx != indices[-1]:
+        indices.append(end_idx)
+
+    return np.array(indices)
 
 
 def get_max_height_width(videos: list["torch.Tensor"]) -> List[int]:
     """
     Get the maximum height and width across all videos in a batch.
     """
-    max_height = max_width = float("-inf")
-    for video in videos:
-        height, width = video.size()[-2:]
-        max_height = max(height, max_height)
-        max_width = max(width, max_width)
+    max_height = max(video.shape[-2] for video in videos)
+    max_width = max(video.shape[-1] for video in videos)
     return (max_height, max_width)
 
 
@@ -161,16 +169,16 @@ def get_resize_output_image_size(
     # The output size must be below the MAX_IMAGE_SIZE
     resolution_max_side = min(MAX_IMAGE_SIZE, resolution_max_side)
     resolution_max_side = max(height, width) if resolution_max_side is None else resolution_max_side
-    aspect_ratio = width / height
 
+    # Integer arithmetic keeps the sizes exact, float aspect ratios can be off by one after truncation
     if width >= height:
+        height = height * resolution_max_side // width
         width = resolution_max_side
-        height = int(width / aspect_ratio)
         if height % 2 != 0:
             height += 1
     elif height > width:
+        width = width * resolution_max_side // height
         height = resolution_max_side
-        width = int(height * aspect_ratio)
         if width % 2 != 0:
             width += 1
 
@@ -272,11 +280,12 @@ class SmolVLMVideoProcessor(BaseVideoProcessor):
             padding = [0, 0, padding_right, padding_bottom]
             video = F.pad(video, padding, fill=fill)
 
-        # Make a pixel mask for the video, where 1 indicates a valid pixel and 0 indicates padding.
+        # Make a pixel mask for the video, where True indicates a valid pixel and False indicates padding.
         pixel_mask = None
         if return_pixel_mask:
-            pixel_mask = torch.zeros_like(video[..., 0, :, :], dtype=torch.int64)
-            pixel_mask[..., : original_size[0], : original_size[1]] = 1
+            pixel_mask = torch.ones((*video.shape[:-3], *original_size), dtype=torch.bool, device=video.device)
+            if original_size != padded_size:
+                pixel_mask = torch.nn.functional.pad(pixel_mask, [0, padding_right, 0, padding_bottom], value=False)
 
         return video, pixel_mask
 
@@ -305,41 +314,70 @@ class SmolVLMVideoProcessor(BaseVideoProcessor):
             if do_resize:
                 stacked_videos = self.resize(stacked_videos, size=size, interpolation=interpolation)
             resized_videos_grouped[shape] = stacked_videos
-        resized_videos = reorder_videos(resized_videos_grouped, grouped_videos_index)
 
-        grouped_videos, grouped_videos_index = group_videos_by_shape(resized_videos)
+        # All videos in a group are resized to the same size and the remaining ops preserve shapes, so the groups are
+        # reused for rescaling, normalizing and padding without regrouping the videos
         processed_videos_grouped = {}
-        for shape, stacked_videos in grouped_videos.items():
-            stacked_videos = self.rescale_and_normalize(
+        for shape, stacked_videos in resized_videos_grouped.items():
+            processed_videos_grouped[shape] = self.rescale_and_normalize(
                 stacked_videos, do_rescale, rescale_factor, do_normalize, image_mean, image_std
             )
-            processed_videos_grouped[shape] = stacked_videos
-
-        processed_videos = reorder_videos(processed_videos_grouped, grouped_videos_index)
 
         if do_pad:
-            pad_size = get_max_height_width(processed_videos)
-            grouped_videos, grouped_videos_index = group_videos_by_shape(processed_videos)
-            processed_padded_mask_grouped = {}
-            processed_videos_grouped = {}
-
-            for shape, stacked_videos in grouped_videos.items():
-                stacked_videos, padded_masks = self.pad(stacked_videos, padded_size=pad_size)
-                processed_videos_grouped[shape] = stacked_videos
-                processed_padded_mask_grouped[shape] = padded_masks
-
+            pad_size = get_max_height_width(list(processed_videos_grouped.values()))
+
+        if return_tensors and len(processed_videos_grouped) == 1:
+            # All videos share the same shape, so the only group is already stacked in the original order
+            (processed_videos,) = processed_videos_grouped.values()
+            if do_pad:
+                processed_videos, pixel_attention_mask = self.pad(processed_videos, padded_size=pad_size)
+        elif return_tensors:
+            # Write every padded group into its slots of a preallocated batch, instead of reordering the padded videos
+            # and stacking them into a second copy of the batch. Padding only changes height and width, everything
+            # else must already match or the writes below would silently broadcast across mismatched dims
+            batched_shapes = {
+                stacked_videos.shape[1:-2] if do_pad else stacked_videos.shape[1:]
+                for stacked_videos in processed_videos_grouped.values()
+            }
+            if len(batched_shapes) > 1:
+                raise ValueError(
+                    "Unable to batch videos with different shapes. Make sure all videos have the same number of frames "
+                    "(and the same size if `do_pad=False`), or set `return_tensors=None`. Got videos of shape "
+                    f"{[tuple(stacked_videos.shape[1:]) for stacked_videos in processed_videos_grouped.values()]}."
+                )
+
+            videos_indices_grouped = {}
+            for index, (shape, _) in grouped_videos_index.items():
+                videos_indices_grouped.setdefault(shape, []).append(index)
+
+            batch_size = len(grouped_videos_index)
+            processed_videos = pixel_attention_mask = None
+            for shape, stacked_videos in processed_videos_grouped.items():
+                if do_pad:
+                    stacked_videos, padded_masks = self.pad(stacked_videos, padded_size=pad_size)
+                if processed_videos is None:
+                    processed_videos = stacked_videos.new_empty((batch_size, *stacked_videos.shape[1:]))
+                    if do_pad:
+                        pixel_attention_mask = padded_masks.new_empty((batch_size, *padded_masks.shape[1:]))
+                indices = videos_indices_grouped[shape]
+                processed_videos[indices] = stacked_videos
+                if do_pad:
+                    pixel_attention_mask[indices] = padded_masks
+        else:
+            if do_pad:
+                padded_videos_grouped = {}
+                processed_padded_mask_grouped = {}
+                for shape, stacked_videos in processed_videos_grouped.items():
+                    stacked_videos, padded_masks = self.pad(stacked_videos, padded_size=pad_size)
+                    padded_videos_grouped[shape] = stacked_videos
+                    processed_padded_mask_grouped[shape] = padded_masks
+                processed_videos_grouped = padded_videos_grouped
+                pixel_attention_mask = reorder_videos(processed_padded_mask_grouped, grouped_videos_index)
             processed_videos = reorder_videos(processed_videos_grouped, grouped_videos_index)
-            pixel_attention_mask = reorder_videos(processed_padded_mask_grouped, grouped_videos_index)
 
-        processed_videos = torch.stack(processed_videos, dim=0) if return_tensors else processed_videos
         data = {"pixel_values": processed_videos}
-
         if do_pad:
-            data["pixel_attention_mask"] = (
-                torch.stack(pixel_attention_mask, dim=0)
-                if do_pad and return_tensors is not None
-                else pixel_attention_mask
-            )
+            data["pixel_attention_mask"] = pixel_attention_mask
         return BatchFeature(data, tensor_type=return_tensors)
 
 
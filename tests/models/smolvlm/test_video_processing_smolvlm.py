@@ -30,7 +30,11 @@ if is_torch_available():
 if is_vision_available():
     if is_torchvision_available():
         from transformers import SmolVLMVideoProcessor
-        from transformers.models.smolvlm.video_processing_smolvlm import get_resize_output_image_size
+        from transformers.models.smolvlm.video_processing_smolvlm import (
+            get_resize_output_image_size,
+            smolvlm_sample_indices_fn,
+        )
+        from transformers.video_utils import VideoMetadata
 
 
 class SmolVLMVideoProcessingTester:
@@ -116,3 +120,61 @@ class SmolVLMVideoProcessingTest(VideoProcessingTestMixin, unittest.TestCase):
 
         video_processor = self.fast_video_processing_class.from_dict(self.video_processor_dict, size=42)
         self.assertEqual(video_processor.size, {"height": 42, "width": 42})
+
+    def test_get_resize_output_image_size(self):
+        # 25 * 1456 / 112 is exactly 325, which float aspect ratios truncate to 324
+        video = torch.zeros((1, 3, 25, 112))
+        self.assertEqual(get_resize_output_image_size(video, resolution_max_side=1456), (326, 1456))
+        video = torch.zeros((1, 3, 112, 25))
+        self.assertEqual(get_resize_output_image_size(video, resolution_max_side=1456), (1456, 326))
+
+    def test_pixel_attention_mask(self):
+        video_processor = self.fast_video_processing_class(**self.video_processor_dict)
+        video_inputs = self.video_processor_tester.prepare_video_inputs(equal_resolution=False, return_tensors="torch")
+        encoding = video_processor(video_inputs, return_tensors="pt")
+
+        pixel_attention_mask = encoding["pixel_attention_mask"]
+        self.assertEqual(pixel_attention_mask.dtype, torch.bool)
+        num_frames, _, max_height, max_width = self.video_processor_tester.expected_output_video_shape(video_inputs)
+        self.assertEqual(tuple(pixel_attention_mask.shape), (len(video_inputs), num_frames, max_height, max_width))
+        for video, mask in zip(video_inputs, pixel_attention_mask):
+            height, width = get_resize_output_image_size(video, self.video_processor_tester.size["longest_edge"])
+            self.assertTrue(mask[:, :height, :width].all())
+            self.assertEqual(mask.sum().item(), mask.shape[0] * height * width)
+
+    def test_batched_outputs_match_unbatched(self):
+        video_processor = self.fast_video_processing_class(**self.video_processor_dict)
+        video_inputs = self.video_processor_tester.prepare_video_inputs(equal_resolution=False, return_tensors="torch")
+
+        encoding = video_processor(video_inputs, return_tensors="pt")
+        unbatched_encoding = video_processor(video_inputs, return_tensors=None)
+        torch.testing.assert_close(encoding["pixel_values"], torch.stack(unbatched_encoding["pixel_values"]))
+        torch.testing.assert_close(
+            encoding["pixel_attention_mask"], torch.stack(unbatched_encoding["pixel_attention_mask"])
+        )
+
+    def test_batched_outputs_mixed_num_frames(self):
+        video_processor = self.fast_video_processing_class(**self.video_processor_dict)
+        video_inputs = [
+            torch.randint(0, 256, (8, 3, 40, 30), dtype=torch.uint8),
+            torch.randint(0, 256, (1, 3, 30, 40), dtype=torch.uint8),
+        ]
+
+        with self.assertRaises(ValueError):
+            video_processor(video_inputs, return_tensors="pt")
+
+        # Unbatched outputs keep each video's own number of frames
+        encoding = video_processor(video_inputs, return_tensors=None)
+        self.assertEqual([video.shape[0] for video in encoding["pixel_values"]], [8, 1])
+
+    def test_sample_indices_fn(self):
+        # (total_num_frames, fps, max_frames, target_fps), covering single frame, duplicated and strided indices
+        sampling_configs = [(1, 30.0, 64, 1), (7, 1.0, 64, 30), (300, 30.0, 64, 1), (4000, 24.0, 64, 1)]
+        for total_num_frames, fps, max_frames, target_fps in sampling_configs:
+            metadata = VideoMetadata(
+                total_num_frames=total_num_frames, fps=fps, duration=total_num_frames / fps, video_backend="opencv"
+            )
+            indices = smolvlm_sample_indices_fn(metadata, max_frames=max_frames, target_fps=target_fps)
+            desired_frames = max(min(int(round(target_fps * metadata.duration)), max_frames), 1)
+            expected_indices = np.unique(np.linspace(0, total_num_frames - 1, desired_frames, dtype=int))
+            self.assertListEqual(indices.tolist(), expected_indices.tolist())
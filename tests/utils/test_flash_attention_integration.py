@@ -0,0 +1,69 @@
+# Copyright 2025 HuggingFace Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+from unittest import mock
+
+from transformers import PretrainedConfig
+from transformers.testing_utils import is_torch_available, require_torch, require_torch_greater_or_equal
+
+
+if is_torch_available():
+    import torch
+
+    from transformers.integrations.flash_attention import flash_attention_forward
+
+    class DummyAttention(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.config = PretrainedConfig()
+            self.is_causal = False
+            self.q_proj = torch.nn.Linear(8, 8)
+
+
+@require_torch
+class FlashAttentionForwardTest(unittest.TestCase):
+    def _run_flash_attention_forward(self, module, query, key, value, **kwargs):
+        # `_flash_attention_forward` needs the `flash_attn` kernels, we only check what it receives
+        with mock.patch(
+            "transformers.integrations.flash_attention._flash_attention_forward", return_value=query
+        ) as mock_forward:
+            flash_attention_forward(module, query, key, value, attention_mask=None, **kwargs)
+        return mock_forward.call_args
+
+    def test_target_dtype_follows_module_dtype(self):
+        module = DummyAttention()
+        query, key, value = (torch.randn(2, 4, 5, 8) for _ in range(3))
+
+        call = self._run_flash_attention_forward(module, query, key, value)
+        self.assertEqual(call.kwargs["target_dtype"], torch.float32)
+        # The Linear layer is cached, but its dtype is read again on every call
+        module.to(torch.float16)
+        with mock.patch.object(module, "modules", wraps=module.modules) as mock_modules:
+            call = self._run_flash_attention_forward(module, query, key, value)
+            mock_modules.assert_not_called()
+        self.assertEqual(call.kwargs["target_dtype"], torch.float16)
+        # The cached layer is not registered as an extra submodule
+        self.assertListEqual(list(module.state_dict().keys()), ["q_proj.weight", "q_proj.bias"])
+
+    @require_torch_greater_or_equal("2.4")
+    def test_target_dtype_from_cpu_autocast(self):
+        module = DummyAttention()
+        query, key, value = (torch.randn(2, 4, 5, 8) for _ in range(3))
+
+        with mock.patch.object(module, "modules", wraps=module.modules) as mock_modules:
+            with torch.autocast("cpu", dtype=torch.bfloat16):
+                call = self._run_flash_attention_forward(module, query, key, value)
+            mock_modules.assert_not_called()
+        self.assertEqual(call.kwargs["target_dtype"], torch.bfloat16)